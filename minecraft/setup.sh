@@ -40,6 +40,16 @@ error() {
   exit 1
 }
 
+# Install a wrapper script as an ec2-user owned executable,
+# skipping the write when the installed copy is already identical
+install_script() {
+  if cmp -s "$1" "$2"; then
+    echo "$2 is unchanged, skipping"
+  else
+    install -m 755 -o ec2-user -g ec2-user "$1" "$2"
+  fi
+}
+
 # Loop through arguments and process them
 for arg in "$@"
 do
@@ -83,6 +93,12 @@ echo "Server Version: $serverVersion"
 echo "JAR URL: $jarUrl"
 echo "Java package: $javaPackage"
 
+jarPath="/home/ec2-user/minecraft_server_${serverVersion}.jar"
+echo "!! Download Minecraft server JAR to $jarPath in the background"
+# The download is independent of package installation, so overlap the two
+sudo -u ec2-user wget -nv -O "$jarPath" "$jarUrl" &
+jarDownloadPid=$!
+
 echo "!! Install JDK"
 yum update -y
 yum install -y "$javaPackage"
@@ -90,59 +106,65 @@ yum install -y "$javaPackage"
 echo "!! Check Java version"
 java -version
 
-echo "!! Ensure /mnt/persist/minecraft exists and is owned by ec2-user"
-mkdir -p /mnt/persist/minecraft
-chown ec2-user:ec2-user /mnt/persist/minecraft
+serverPath="/mnt/persist/minecraft/${serverFolder}"
 
-echo "!! Ensure the server folder exists and is owned by ec2-user"
-mkdir -p "/mnt/persist/minecraft/${serverFolder}"
-chown ec2-user:ec2-user "/mnt/persist/minecraft/${serverFolder}"
+echo "!! Ensure /mnt/persist/minecraft and the server folder exist and are owned by ec2-user"
+# install -d creates and chowns both directories in a single process
+install -d -o ec2-user -g ec2-user /mnt/persist/minecraft "$serverPath"
 
-echo "!! Write /etc/systemd/system/minecraft-server.service"
-cat << EOF > /etc/systemd/system/minecraft-server.service
+unitPath="/etc/systemd/system/minecraft-server.service"
+unitContent=$(cat << EOF
 [Unit]
 Description=Minecraft Server
 After=network.target
 
 [Service]
 User=ec2-user
-WorkingDirectory=/mnt/persist/minecraft/${serverFolder}
-ExecStart=/mnt/persist/minecraft/${serverFolder}/start-minecraft.sh
-ExecStop=/mnt/persist/minecraft/${serverFolder}/stop-minecraft.sh
+WorkingDirectory=${serverPath}
+ExecStart=${serverPath}/start-minecraft.sh
+ExecStop=${serverPath}/stop-minecraft.sh
 TimeoutStopSec=60
 
 [Install]
 WantedBy=multi-user.target
 EOF
+)
+
+echo "!! Write $unitPath"
+if [ "$unitContent" == "$(cat "$unitPath" 2>/dev/null)" ]; then
+  echo "$unitPath is unchanged, skipping"
+  unitChanged=0
+else
+  echo "$unitContent" > "$unitPath"
+  unitChanged=1
+fi
 
-startScriptPath="/mnt/persist/minecraft/${serverFolder}/start-minecraft.sh"
+startScriptPath="${serverPath}/start-minecraft.sh"
 echo "!! Install the start-minecraft.sh wrapper script at $startScriptPath"
-cp minecraft/start-minecraft.sh "$startScriptPath"
-# Make the script executable
-chmod +x "$startScriptPath"
-# Ensure the script is owned by ec2-user
-chown ec2-user:ec2-user "$startScriptPath"
+install_script minecraft/start-minecraft.sh "$startScriptPath"
 
-stopScriptPath="/mnt/persist/minecraft/${serverFolder}/stop-minecraft.sh"
+stopScriptPath="${serverPath}/stop-minecraft.sh"
 echo "!! Install the stop-minecraft.sh wrapper script at $stopScriptPath"
-cp minecraft/stop-minecraft.sh "$stopScriptPath"
-# Make the script executable
-chmod +x "$stopScriptPath"
-# Ensure the script is owned by ec2-user
-chown ec2-user:ec2-user "$stopScriptPath"
+install_script minecraft/stop-minecraft.sh "$stopScriptPath"
 
-jarPath="/home/ec2-user/minecraft_server_${serverVersion}.jar"
-echo "!! Download Minecraft server JAR to $jarPath"
-sudo -u ec2-user wget -O "$jarPath" "$jarUrl"
+echo "!! Wait for the Minecraft server JAR download"
+if ! wait "$jarDownloadPid"; then
+  echo "Warning: download of $jarUrl failed" >&2
+fi
 
-symlinkPath="/mnt/persist/minecraft/${serverFolder}/minecraft_server.jar"
+symlinkPath="${serverPath}/minecraft_server.jar"
 echo "!! Symlink the jar to $symlinkPath"
 sudo -u ec2-user ln -s "$jarPath" "$symlinkPath"
 
-echo "!! reload systemd"
-# Reload systemd to recognize the new service and enable it to start on boot
-systemctl daemon-reload
-systemctl enable minecraft-server.service
+echo "!! enable minecraft-server"
+# Enable the service to start on boot; enable implicitly reloads systemd,
+# so the new unit is recognised without a separate daemon-reload.
+# When the unit is unchanged there is nothing new to load, so skip the reload.
+if [ "$unitChanged" -eq 1 ]; then
+  systemctl enable minecraft-server.service
+else
+  systemctl enable --no-reload minecraft-server.service
+fi
 
 # echo "!! start minecraft-server"
 # systemctl start minecraft-server.service